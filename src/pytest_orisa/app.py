@@ -1,7 +1,14 @@
+import asyncio
+import codecs
+import heapq
 import os
+import select
+import threading
 from functools import partial
+from operator import itemgetter
 from pathlib import Path
 from subprocess import Popen
+from time import monotonic
 from typing import cast
 
 from pytest import ExitCode
@@ -33,7 +40,7 @@ from textual.worker import Worker, get_current_worker
 
 from pytest_orisa.cache import load_cache, write_cache
 from pytest_orisa.components.code import CodeViewerScreen
-from pytest_orisa.components.collection import TestsTree
+from pytest_orisa.components.collection import SearchEntry, TestsTree, char_mask
 from pytest_orisa.components.flags import PytestCliFlagsModal
 from pytest_orisa.components.footer import OrisaFooter
 from pytest_orisa.components.result import (
@@ -50,6 +57,28 @@ from pytest_orisa.event_dispatcher import (
 )
 from pytest_orisa.plugin import run_node
 
+MAX_SEARCH_HITS = 50
+SEARCH_YIELD_EVERY = 512
+RUN_LOG_READ_SIZE = 1 << 16
+RUN_LOG_BATCH_LINES = 256
+RUN_LOG_FLUSH_INTERVAL = 0.016
+RUN_CANCEL_POLL_INTERVAL = 0.1
+
+# exit codes of a finished run -> (notification prefix, color, severity)
+RUN_OUTCOMES: dict[int, tuple[str, str, str]] = {
+    ExitCode.OK: ("[cyan]PASSED[/] ", "cyan", "information"),
+    ExitCode.TESTS_FAILED: ("[crimson]FAILED[/] ", "crimson", "error"),
+}
+RUN_ERRORS = frozenset((ExitCode.USAGE_ERROR, ExitCode.NO_TESTS_COLLECTED))
+
+
+def wait_for_output(fd: int, timeout: float) -> bool:
+    if os.name == "nt":
+        # select() only takes sockets on Windows, fall back to a blocking read
+        return True
+    readable, _, _ = select.select([fd], [], [], timeout)
+    return bool(readable)
+
 
 class SearchCommandPalette(CommandPalette):
     DEFAULT_CSS = """
@@ -78,20 +107,54 @@ class SearchCommandPalette(CommandPalette):
 
 
 class SearchTestsCommands(Provider):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # (query, search index it ran against, entries that matched)
+        self._last_search: tuple[str, list[SearchEntry], list[SearchEntry]] | None = (
+            None
+        )
+
+    def candidates(self, query: str) -> list[SearchEntry]:
+        search_index = self.orisa.tests_tree.search_index
+        if self._last_search is not None:
+            last_query, last_index, last_matches = self._last_search
+            # a name matching the extended query also matched its prefix
+            if last_index is search_index and query.lower().startswith(
+                last_query.lower()
+            ):
+                return last_matches
+        return search_index
+
     async def search(self, query: str) -> Hits:
         matcher: Matcher = self.matcher(query)
-        app: App = self.orisa
+        app: OrisaApp = self.orisa
+        search_index = app.tests_tree.search_index
+
+        # the matcher needs every query character somewhere in the name, names
+        # missing any of them can be skipped without scoring
+        query_mask = char_mask(query)
 
-        for node in app.tests_tree.tree_nodes.values():
-            if node.data and isinstance(node.data, dict):
-                score = matcher.match(node.data["name"])
+        scored: list[tuple[float, SearchEntry]] = []
+        for position, entry in enumerate(self.candidates(query), 1):
+            if entry[3] & query_mask == query_mask:
+                score = matcher.match(entry[1])
                 if score > 0:
-                    yield Hit(
-                        score,
-                        matcher.highlight(node.data["name"]),
-                        partial(app.select_node, node),
-                        help=f"{node.data['type']} | {node.data['path']}",
-                    )
+                    scored.append((score, entry))
+            if position % SEARCH_YIELD_EVERY == 0:
+                # let the next keystroke in, the palette cancels stale searches
+                await asyncio.sleep(0)
+        self._last_search = (query, search_index, [entry for _, entry in scored])
+
+        # only the best hits are shown, so only those pay for highlighting
+        for score, (node, name, help_text, _) in heapq.nlargest(
+            MAX_SEARCH_HITS, scored, key=itemgetter(0)
+        ):
+            yield Hit(
+                score,
+                matcher.highlight(name),
+                partial(app.select_node, node),
+                help=help_text,
+            )
 
     @property
     def orisa(self) -> "OrisaApp":
@@ -117,20 +180,44 @@ class OrisaApp(App):
         self.event_dispatcher = EventDispatcher()
         self.current_selected_node: dict = {}
         self.pytest_cli_flags: list[tuple[str, bool]] = []
+        self._persisted_cli_flags: list[tuple[str, bool]] = self.pytest_cli_flags
+        self._cache_write_lock = threading.Lock()
         self.current_run_worker: Worker | None = None
+        self._last_log_width = -1
+
+    def on_mount(self) -> None:
+        self.node_preview = self.query_one(NodePreview)
 
     async def on_load(self) -> None:
         self.start_event_dispatcher()
         await wait_for_server("localhost", 1337)
         self.pytest_cli_flags = load_cache() or []
+        self._persisted_cli_flags = self.pytest_cli_flags
 
     @work(thread=True, exclusive=True)
     def start_event_dispatcher(self) -> None:
         self.event_dispatcher.start()
 
+    def set_pytest_cli_flags(self, pytest_cli_flags: list[tuple[str, bool]]) -> None:
+        self.pytest_cli_flags = pytest_cli_flags
+        self.persist_pytest_cli_flags()
+
+    @work(thread=True, group="cache-write")
+    def persist_pytest_cli_flags(self) -> None:
+        self.write_latest_cli_flags()
+
+    def write_latest_cli_flags(self) -> None:
+        # writes run one at a time and always store the newest flags, so a save
+        # that started earlier can never land on disk after a later one
+        with self._cache_write_lock:
+            pytest_cli_flags = self.pytest_cli_flags
+            if self._persisted_cli_flags is not pytest_cli_flags:
+                write_cache(pytest_cli_flags)
+                self._persisted_cli_flags = pytest_cli_flags
+
     async def action_quit(self) -> None:
         self.event_dispatcher.stop()
-        write_cache(self.pytest_cli_flags)
+        self.write_latest_cli_flags()
         await super().action_quit()
 
     def action_open_search(self) -> None:
@@ -143,10 +230,8 @@ class OrisaApp(App):
         self.show_sidebar = not self.show_sidebar
 
     def action_clear_all_runs(self) -> None:
-        total_cleared = 0
-        for widget in self.query(RunContent):
-            total_cleared += widget.tab_count
-            widget.clear_panes()
+        total_cleared = self.run_content.tab_count
+        self.run_content.clear_panes()
 
         self.tests_tree.reset_tree_labels()
 
@@ -183,16 +268,7 @@ class OrisaApp(App):
             self.push_screen(PytestCliFlagsModal())
 
     def get_tree_node_by_pytest_nodeid(self, nodeid: str) -> TreeNode | None:
-        return next(
-            (
-                node
-                for node in self.tests_tree.tree_nodes.values()
-                if node.data
-                and isinstance(node.data, dict)
-                and node.data["nodeid"] == nodeid
-            ),
-            None,
-        )
+        return self.tests_tree.get_node_by_nodeid(nodeid)
 
     def select_node(self, node: TreeNode) -> None:
         self.tests_tree.scroll_to_node(node)
@@ -229,9 +305,13 @@ class OrisaApp(App):
             self.current_selected_node = node_data
 
             width_value = self.run_content.size.width - 10
-            os.environ["ORISA_RUN_LOG_WIDTH"] = str(width_value)
+            if width_value != self._last_log_width:
+                self._last_log_width = width_value
+                os.environ["ORISA_RUN_LOG_WIDTH"] = str(width_value)
 
-        self.query_one(NodePreview).node_data = event.node.data
+        # skip the reactive's equality check (a deep dict compare) for the same node
+        if self.node_preview.node_data is not node_data:
+            self.node_preview.node_data = node_data
 
     @on(TestSessionStatusBar.CancelTestRun)
     def handle_cancel_test_run(self) -> None:
@@ -253,7 +333,7 @@ class OrisaApp(App):
             thread=True,
         )
 
-        self.query(ContentTabs).last().focus()
+        self.run_content.query(ContentTabs).last().focus()
 
     async def run_node(
         self,
@@ -264,30 +344,69 @@ class OrisaApp(App):
         run_worker = get_current_worker()
         self.current_run_worker = run_worker
 
-        process: Popen[str] = run_node(
+        process: Popen[bytes] = run_node(
             node=self.current_selected_node,
             pytest_cli_flags=pytest_cli_flags,
         )
         if process.stdout:
             with process.stdout:
-                for line in iter(process.stdout.readline, ""):
+                fd = process.stdout.fileno()
+                decoder = codecs.getincrementaldecoder("utf-8")("replace")
+                partial_line = ""
+                pending: list[str] = []
+                last_flush = monotonic()
+                while True:
                     if run_worker.is_cancelled:
                         process.terminate()
-                        run_result.run_log.write_lines(
+                        pending.extend(
                             [
                                 "".join(["-" * 80, "\n"]),
                                 "Run cancelled \n",
                                 "The test execution was interrupted.\n",
                             ]
                         )
+                        partial_line = ""
                         break
-                    run_result.run_log.write_line(line)
+
+                    # poll so a cancel is noticed even while pytest is silent
+                    if not wait_for_output(fd, RUN_CANCEL_POLL_INTERVAL):
+                        continue
+                    chunk = os.read(fd, RUN_LOG_READ_SIZE)
+                    if not chunk:
+                        break
+
+                    lines = (partial_line + decoder.decode(chunk)).splitlines(
+                        keepends=True
+                    )
+                    # hold back a trailing line until its newline arrives
+                    partial_line = (
+                        lines.pop() if lines and not lines[-1].endswith("\n") else ""
+                    )
+                    pending.extend(lines)
+
+                    # a short read means the pipe is drained, anything else means
+                    # more output is queued and can share the next write
+                    if (
+                        len(chunk) < RUN_LOG_READ_SIZE
+                        or len(pending) >= RUN_LOG_BATCH_LINES
+                        or monotonic() - last_flush >= RUN_LOG_FLUSH_INTERVAL
+                    ):
+                        self.call_from_thread(run_result.run_log.write_lines, pending)
+                        pending = []
+                        last_flush = monotonic()
+
+                if partial_line := partial_line + decoder.decode(b"", final=True):
+                    pending.append(partial_line)
+                if pending:
+                    self.call_from_thread(run_result.run_log.write_lines, pending)
         process.wait()
 
         if process.returncode != ExitCode.OK and process.stderr:
             with process.stderr:
-                for line in iter(process.stderr.readline, ""):
-                    run_result.run_log.write_line(line)
+                self.call_from_thread(
+                    run_result.run_log.write_lines,
+                    process.stderr.read().decode("utf-8", "replace").splitlines(),
+                )
 
         run_button.reset()
 
@@ -303,20 +422,17 @@ class OrisaApp(App):
         run_result: RunResult,
         current_running_node: dict,
     ) -> None:
-        if (
-            returncode == ExitCode.USAGE_ERROR
-            or returncode == ExitCode.NO_TESTS_COLLECTED
-        ):
-            self.handle_error()
+        if returncode in RUN_OUTCOMES:
+            self.handle_test_result(returncode, run_result, current_running_node)
+        elif returncode in RUN_ERRORS:
+            self.handle_error(run_result)
         elif returncode == -15:
             self.handle_cancelled_run()
-        elif returncode in (ExitCode.OK, ExitCode.TESTS_FAILED):
-            self.handle_test_result(returncode, run_result, current_running_node)
 
-    def handle_error(self) -> None:
+    def handle_error(self, run_result: RunResult) -> None:
         self.run_content.tab_color = "darkgrey"
         self.tests_tree.reset_tree_labels()
-        self.query(TestSessionStatusBar).last().display = False
+        run_result.status_bar.display = False
 
     def handle_cancelled_run(self) -> None:
         self.run_content.tab_color = "darkgrey"
@@ -331,14 +447,11 @@ class OrisaApp(App):
     ) -> None:
         run_result.report = self.event_dispatcher.get_event_data(EventType.REPORT)
 
-        if returncode == ExitCode.OK:
-            status, color, severity = "PASSED", "cyan", "information"
-        else:
-            status, color, severity = "FAILED", "crimson", "error"
+        message_prefix, color, severity = RUN_OUTCOMES[returncode]
 
         self.run_content.tab_color = color
         self.app.notify(
-            message=f"[{color}]{status}[/] {current_running_node['name']}",
+            message=message_prefix + current_running_node["name"],
             severity=severity,
             timeout=2,
         )
@@ -347,11 +460,10 @@ class OrisaApp(App):
         start_root = (
             self.tests_tree.root.children[0] if self.tests_tree.root.children else None
         )
-
-        path = self.current_selected_node["path"].split("/")
         if not start_root or not start_root.data:
             return ""
 
+        path = self.current_selected_node["path"].split("/")
         try:
             start_root_index = path.index(start_root.data["name"])
         except ValueError:
@@ -1,37 +1,58 @@
-import pickle
+import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Any
 
 from platformdirs import user_cache_dir
 
-CACHE_VERSION = 1
+CACHE_VERSION = 2
 
 
 def get_cache_file() -> Path:
     cache_dir = Path(user_cache_dir(appname="pytest_orisa"))
-    cache_file = cache_dir / f"cache-{CACHE_VERSION}.pickle"
+    cache_file = cache_dir / f"cache-{CACHE_VERSION}.json"
     return cache_file
 
 
-def load_cache() -> Any | None:
+def load_cache() -> list[tuple[str, bool]] | None:
     cache_file = get_cache_file()
     try:
-        with cache_file.open("rb") as f:
-            cache = pickle.load(f)
+        with cache_file.open(encoding="utf-8") as f:
+            cache = json.load(f)
     except (
-        pickle.UnpicklingError,
         ValueError,
         IndexError,
         FileNotFoundError,
         AssertionError,
     ):
         return None
-    else:
-        return cache
+
+    # the file can be edited by hand, anything but [flag, is_active] pairs is
+    # treated like a missing cache
+    if not isinstance(cache, list) or not all(
+        isinstance(entry, list)
+        and len(entry) == 2
+        and isinstance(entry[0], str)
+        and isinstance(entry[1], bool)
+        for entry in cache
+    ):
+        return None
+    # JSON has no tuples, flags come back as [flag, is_active] pairs
+    return [(flag, is_active) for flag, is_active in cache]
 
 
 def write_cache(cache) -> None:
     cache_file = get_cache_file()
     cache_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(cache_file, "wb") as f:
-        pickle.dump(cache, f)
+    # write next to the cache file and swap it in, so a reader never sees a
+    # partially written cache
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=cache_file.parent, suffix=".tmp", delete=False
+    ) as f:
+        try:
+            json.dump(cache, f)
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, cache_file)
@@ -2,13 +2,47 @@ import os
 import platform
 import subprocess
 from pathlib import Path
+from typing import Callable
 
+from textual import work
 from textual.app import ComposeResult
 from textual.containers import Grid, Horizontal
 from textual.screen import ModalScreen
 from textual.widgets import Button, TextArea
 
 
+def _macos_editor_command(editor: str, file_path: str) -> list[str]:
+    if editor == "code":
+        return ["open", "-a", "Visual Studio Code", file_path]
+    return [editor, file_path]
+
+
+def _editor_command(editor: str, file_path: str) -> list[str]:
+    return [editor, file_path]
+
+
+EDITOR_COMMANDS: dict[str, Callable[[str, str], list[str]]] = {
+    "Darwin": _macos_editor_command,
+    "Linux": _editor_command,
+    "Windows": _editor_command,
+}
+SYSTEM = platform.system()
+
+
+def open_in_editor(file_path: str) -> None:
+    build_command = EDITOR_COMMANDS.get(SYSTEM)
+    if build_command is None:
+        return
+
+    editor = os.getenv("EDITOR", "code")
+    # don't wait for the editor, it may well outlive the app
+    subprocess.Popen(
+        build_command(editor, file_path),
+        shell=SYSTEM == "Windows",
+        start_new_session=True,
+    )
+
+
 class CodeViewerScreen(ModalScreen):
     DEFAULT_CSS = """
         CodeViewerScreen {
@@ -43,49 +77,42 @@ class CodeViewerScreen(ModalScreen):
         self.location = location
 
     def compose(self) -> ComposeResult:
-        textarea = TextArea(
-            text=Path(self.current_selected_node["path"]).read_text(encoding="utf-8"),
+        self.textarea = TextArea(
             show_line_numbers=True,
             language="python",
             read_only=True,
             id="code-viewer",
         )
-        textarea.move_cursor((self.current_selected_node["lineno"], 0), center=True)
 
         grid = Grid(
             Horizontal(
                 Button("Close", variant="primary", id="cancel"),
                 Button("Open file in Editor", variant="primary", id="open-in-editor"),
             ),
-            textarea,
+            self.textarea,
             id="code-grid",
         )
         grid.border_title = self.location
         grid.styles.border_title_align = "center"
         yield grid
 
+    def on_mount(self) -> None:
+        self.load_code()
+
+    @work(thread=True, exclusive=True)
+    def load_code(self) -> None:
+        source = Path(self.current_selected_node["path"]).read_bytes()
+        text = source.decode("utf-8", errors="replace")
+        self.app.call_from_thread(self.show_code, text)
+
+    def show_code(self, text: str) -> None:
+        self.textarea.text = text
+        self.textarea.move_cursor(
+            (self.current_selected_node["lineno"], 0), center=True
+        )
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "cancel":
             self.app.pop_screen()
         elif event.button.id == "open-in-editor":
-            file_path = self.current_selected_node["path"]
-
-            editor = os.getenv("EDITOR", "code")
-            # handle better this part
-            system = platform.system()
-
-            if system == "Darwin":
-                if editor == "code":
-                    subprocess.run(["open", "-a", "Visual Studio Code", file_path])
-                else:
-                    subprocess.run([editor, file_path])
-            elif system == "Linux":
-                if editor == "code":
-                    subprocess.run(["code", file_path])
-                else:
-                    subprocess.run([editor, file_path])
-            elif system == "Windows":
-                if editor == "code":
-                    subprocess.run(["code", file_path], shell=True)
-                else:
-                    subprocess.run([editor, file_path], shell=True)
+            open_in_editor(self.current_selected_node["path"])
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, cast
+import asyncio
+from typing import TYPE_CHECKING, Any, cast
 
 from textual.reactive import var
 from textual.widgets import Tree
@@ -10,6 +11,26 @@ from pytest_orisa.plugin import collect_tests
 if TYPE_CHECKING:
     from pytest_orisa.app import OrisaApp
 
+SearchEntry = tuple[TreeNode, str, str, int]
+PendingNode = tuple[int, str, Any, bool]
+
+TREE_BATCH_SIZE = 200
+
+RUNNING_SUFFIX = " [yellow]⧗ [/]"
+FAILED_SUFFIX = " [red]✖ [/]"
+SKIPPED_SUFFIX = " [yellow]◉ [/]"
+
+
+def char_mask(text: str) -> int:
+    """Bitmap of the ASCII letters and digits in text, ignoring case."""
+    mask = 0
+    for char in text.lower():
+        if "a" <= char <= "z":
+            mask |= 1 << (ord(char) - 97)
+        elif "0" <= char <= "9":
+            mask |= 1 << (ord(char) - 22)
+    return mask
+
 
 class TestsTree(Tree):
     DEFAULT_CSS = """
@@ -41,85 +62,145 @@ class TestsTree(Tree):
     auto_expand = var(False)
     show_root = var(False)
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._search_index: list[SearchEntry] = []
+        self._nodeid_index: dict[str, TreeNode] = {}
+        # nodes showing a status label, mapped to the label they show
+        self.dirty_labels: dict[TreeNode, str] = {}
+
     def on_mount(self) -> None:
-        self.orisa.event_dispatcher.register_handler(
-            event_type=EventType.TESTS_COLLECTED,
-            handler=lambda data: self.build_tree(data),
-        )
-        self.orisa.event_dispatcher.register_handler(
-            event_type=EventType.TESTS_SCHEDULED,
-            handler=lambda nodeids: self.mark_tests_as_running(nodeids),
-        )
-        self.orisa.event_dispatcher.register_handler(
-            event_type=EventType.TEST_OUTCOME,
-            handler=lambda data: self.update_test_outcome(data),
+        self.orisa.event_dispatcher.register_handlers(
+            {
+                EventType.TESTS_COLLECTED: self.build_tree,
+                EventType.TESTS_SCHEDULED: self.mark_tests_as_running,
+                EventType.TEST_OUTCOME: self.update_test_outcome,
+            }
         )
         collect_tests()
 
     def build_tree(self, data: dict) -> None:
+        # runs on the event dispatcher's thread: do the tree walk here and only
+        # hand the widget updates over to the UI thread
         if data is not None:
-            self.clear()
-            self.loading = True
-            self.update_tree(plugin_pytest_tree=data["data"], parent=self.root)
-            self.loading = False
-            self.border_title = f"Tests [black on white ] {data['meta']['total']} [/]"
+            nodes = self.flatten_tree(data["data"])
+            self.app.call_from_thread(self.apply_tree, nodes, data["meta"]["total"])
 
-    def update_tree(self, *, plugin_pytest_tree: dict, parent: TreeNode | Tree) -> None:
-        if isinstance(parent, Tree):
-            parent = parent.root
+    @staticmethod
+    def flatten_tree(plugin_pytest_tree: dict) -> list[PendingNode]:
+        """Order the collected tree so that every parent precedes its children.
 
-        def add_children(children: list, parent_node: TreeNode) -> None:
-            for child in children:
-                has_children: bool = "children" in child and child["children"]
-                if has_children:
-                    node: TreeNode = parent_node.add(
-                        child["name"], expand=True, data=child
-                    )
-                    add_children(child["children"], node)
-                else:
-                    parent_node.add_leaf(child["name"], data=child)
+        Entries are (parent position, label, data, has children), the tree root
+        being parent position -1.
+        """
+        nodes: list[PendingNode] = []
+        stack: list[tuple[int, list]] = []
 
         for key, value in plugin_pytest_tree.items():
-            if isinstance(value, dict) and "children" in value and value["children"]:
-                node: TreeNode = parent.add(key, expand=True, data=value)
-                self.select_node(node)
-                add_children(value["children"], node)
+            children = value.get("children")
+            if children:
+                stack.append((len(nodes), children))
+            nodes.append((-1, key, value, bool(children)))
+
+        # walk with an explicit stack, deep trees must not hit the recursion limit
+        while stack:
+            parent, children = stack.pop()
+            for child in children:
+                grandchildren = child.get("children")
+                if grandchildren:
+                    stack.append((len(nodes), grandchildren))
+                nodes.append((parent, child["name"], child, bool(grandchildren)))
+
+        return nodes
+
+    async def apply_tree(self, nodes: list[PendingNode], total: int) -> None:
+        self.dirty_labels.clear()
+        self._nodeid_index = {}
+        self._search_index = []
+        self.clear()
+        self.loading = True
+
+        tree_nodes: list[TreeNode] = []
+        for position, (parent, label, data, has_children) in enumerate(nodes, 1):
+            parent_node = self.root if parent < 0 else tree_nodes[parent]
+            if has_children:
+                node = parent_node.add(label, expand=True, data=data)
+                if parent < 0:
+                    self.select_node(node)
             else:
-                parent.add_leaf(key, data=key)
+                node = parent_node.add_leaf(label, data=data)
+            tree_nodes.append(node)
+
+            if position % TREE_BATCH_SIZE == 0:
+                # give the event loop a turn between batches on large collections
+                await asyncio.sleep(0)
+
+        self.build_node_indexes()
+        self.loading = False
+        self.border_title = f"Tests [black on white ] {total} [/]"
+
+    def build_node_indexes(self) -> None:
+        # every node but the hidden root carries its collected node dict
+        data_nodes = [node for node in self.tree_nodes.values() if node.data]
+        self._nodeid_index = {node.data["nodeid"]: node for node in data_nodes}
+        self._search_index = [
+            (
+                node,
+                node.data["name"],
+                f"{node.data['type']} | {node.data['path']}",
+                char_mask(node.data["name"]),
+            )
+            for node in data_nodes
+        ]
+
+    def get_node_by_nodeid(self, nodeid: str) -> TreeNode | None:
+        return self._nodeid_index.get(nodeid)
 
     def mark_tests_as_running(self, nodeids: list[str]) -> None:
-        for node in self.tree_nodes.values():
-            if (
-                node.data
-                and isinstance(node.data, dict)
-                and node.data.get("nodeid") in nodeids
-            ):
-                node.label = f"{node.data['name']} [yellow]⧗ [/]"
+        for nodeid in set(nodeids):
+            node = self._nodeid_index.get(nodeid)
+            if node is not None:
+                self.set_status_label(node, node.data["name"] + RUNNING_SUFFIX)
 
     def update_test_outcome(self, data: dict) -> None:
-        for node in self.tree_nodes.values():
-            if (
-                node.data
-                and isinstance(node.data, dict)
-                and node.data.get("nodeid") == data.get("nodeid")
-            ):
-                status = data.get("status", "")
-                if status == "passed":
-                    node.label = f"{node.data['name']} [green]● [/] [grey58]{data.get('duration'):.1f}s[/]"
-                elif status == "failed":
-                    node.label = f"{node.data['name']} [red]✖ [/]"
-                elif status == "skipped":
-                    node.label = f"{node.data['name']} [yellow]◉ [/]"
+        node = self._nodeid_index.get(data.get("nodeid", ""))
+        if node is None:
+            return
+
+        name = node.data["name"]
+        status = data.get("status", "")
+        if status == "passed":
+            label = f"{name} [green]● [/] [grey58]{data.get('duration'):.1f}s[/]"
+        elif status == "failed":
+            label = name + FAILED_SUFFIX
+        elif status == "skipped":
+            label = name + SKIPPED_SUFFIX
+        else:
+            return
+        self.set_status_label(node, label)
+
+    def set_status_label(self, node: TreeNode, label: str) -> None:
+        # setting a label re-parses the markup and refreshes the tree, skip it
+        # when the node already shows this status
+        if self.dirty_labels.get(node) != label:
+            node.label = label
+            self.dirty_labels[node] = label
 
     def reset_tree_labels(self) -> None:
-        for node in self.tree_nodes.values():
-            if node.data and isinstance(node.data, dict):
-                node.label = node.data["name"]
+        # only nodes touched by a run carry a status label; swap the mapping first as
+        # outcome events may still be arriving from the dispatcher thread
+        dirty_labels, self.dirty_labels = self.dirty_labels, {}
+        for node in dirty_labels:
+            node.label = node.data["name"]
 
     @property
     def tree_nodes(self) -> dict[NodeID, TreeNode]:
         return self._tree_nodes
 
+    @property
+    def search_index(self) -> list[SearchEntry]:
+        return self._search_index
+
     @property
     def orisa(self) -> "OrisaApp":
         return cast("OrisaApp", self.app)
@@ -1,13 +1,61 @@
-from typing import cast
-
 from textual import on
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, VerticalScroll
-from textual.dom import DOMNode
+from textual.message import Message
 from textual.screen import ModalScreen
 from textual.widgets import Button, Input
 
 
+class FlagInputRow(Horizontal):
+    class Remove(Message):
+        """A message to remove a flag row from the modal."""
+
+        def __init__(self, row: "FlagInputRow") -> None:
+            self.row = row
+            super().__init__()
+
+    def __init__(self, input_id: str, value: str, is_active: bool) -> None:
+        self.is_active = is_active
+        self.flag_input = Input(
+            value=value,
+            placeholder="e.g., --foo=bar",
+            id=input_id,
+        )
+        self.ignore_button = Button(
+            "◼",
+            classes="ignore-button",
+            id=f"{input_id}-ignore",
+        )
+        remove_button = Button(
+            "🗑️",
+            classes="remove-button",
+            id=f"{input_id}-remove",
+        )
+        super().__init__(
+            self.flag_input, self.ignore_button, remove_button, classes="input-row"
+        )
+        self.update_ignore_state()
+
+    def update_ignore_state(self) -> None:
+        self.ignore_button.set_class(self.is_active, "ignore-active")
+        self.ignore_button.set_class(not self.is_active, "ignore-inactive")
+        self.ignore_button.tooltip = (
+            "Disable this flag" if self.is_active else "Enable this flag"
+        )
+        self.set_class(not self.is_active, "ignored")
+
+    @on(Button.Pressed, ".ignore-button")
+    def toggle_ignore(self, event: Button.Pressed) -> None:
+        event.stop()
+        self.is_active = not self.is_active
+        self.update_ignore_state()
+
+    @on(Button.Pressed, ".remove-button")
+    def remove_row(self, event: Button.Pressed) -> None:
+        event.stop()
+        self.post_message(self.Remove(self))
+
+
 class PytestCliFlagsModal(ModalScreen):
     DEFAULT_CSS = """
         PytestCliFlagsModal {
@@ -64,14 +112,18 @@ class PytestCliFlagsModal(ModalScreen):
         }
     """
 
-    @property
-    def inputs_container(self) -> VerticalScroll:
-        return self.query_one("#inputs-container", VerticalScroll)
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._rows: list[FlagInputRow] = []
+        self._last_input: Input | None = None
+        # never reused, so a removed row's ids can't collide with a new row's
+        self._next_input_idx = 0
 
     def compose(self) -> ComposeResult:
         with Container() as container:
             container.border_title = "[black on cyan] Pytest CLI Flags [/]"
-            yield VerticalScroll(id="inputs-container")
+            self.inputs_container = VerticalScroll(id="inputs-container")
+            yield self.inputs_container
             with Horizontal(id="button-container"):
                 yield Button("➕ Add", id="add-flag")
                 yield Button("Done", id="done")
@@ -82,45 +134,26 @@ class PytestCliFlagsModal(ModalScreen):
     def load_saved_flags(self) -> None:
         saved_flags = getattr(self.app, "pytest_cli_flags", [])
         self.inputs_container.remove_children()  # Clear existing inputs
+        self._rows.clear()
 
         if saved_flags:
-            for flag, is_active in saved_flags:
-                new_input = self.add_input(flag, is_active)
-                self.inputs_container.mount(new_input)
+            rows = [self.add_input(flag, is_active) for flag, is_active in saved_flags]
         else:
-            new_input = self.add_input()
-            self.inputs_container.mount(new_input)
+            rows = [self.add_input()]
+        self.inputs_container.mount_all(rows)
 
         self.focus_last_input()
 
-    def add_input(self, value: str = "", is_active: bool = True) -> Horizontal:
-        input_id = f"flag-input-{len(self.inputs_container.query('.input-row'))}"
-        input_widget = Input(
-            value=value,
-            placeholder="e.g., --foo=bar",
-            id=input_id,
-        )
-        remove_button = Button(
-            "🗑️",
-            classes="remove-button",
-            id=f"{input_id}-remove",
-        )
-        ignore_button = Button(
-            "◼",
-            tooltip="Disable this flag" if is_active else "Enable this flag",
-            classes=f"ignore-button {'ignore-active' if is_active else 'ignore-inactive'}",
-            id=f"{input_id}-ignore",
-        )
-
-        input_row = Horizontal(
-            input_widget, ignore_button, remove_button, classes="input-row"
-        )
+    def add_input(self, value: str = "", is_active: bool = True) -> FlagInputRow:
+        input_row = FlagInputRow(f"flag-input-{self._next_input_idx}", value, is_active)
+        self._next_input_idx += 1
+        self._rows.append(input_row)
+        self._last_input = input_row.flag_input
         return input_row
 
     def focus_last_input(self) -> None:
-        inputs = self.query(Input)
-        if inputs:
-            inputs.last().focus()
+        if self._last_input is not None:
+            self._last_input.focus()
 
     @on(Button.Pressed, "#add-flag")
     async def add_new_input(self) -> None:
@@ -133,38 +166,22 @@ class PytestCliFlagsModal(ModalScreen):
         self.save_flags()
         self.dismiss()
 
-    @on(Button.Pressed, ".remove-button")
-    def remove_input(self, event: Button.Pressed) -> None:
-        if len(self.inputs_container.children) > 1:
-            cast(Horizontal, event.button.parent).remove()
-
-    @on(Button.Pressed, ".ignore-button")
-    def toggle_ignore(self, event: Button.Pressed) -> None:
-        button = event.button
-        input_row: DOMNode | None = button.parent
-
-        if input_row is not None:
-            if "ignore-active" in button.classes:
-                button.remove_class("ignore-active")
-                button.add_class("ignore-inactive")
-                input_row.add_class("ignored")
-                button.tooltip = "Enable this flag"
-            else:
-                button.remove_class("ignore-inactive")
-                button.add_class("ignore-active")
-                input_row.remove_class("ignored")
-                button.tooltip = "Disable this flag"
+    @on(FlagInputRow.Remove)
+    def remove_input(self, event: FlagInputRow.Remove) -> None:
+        if len(self._rows) > 1:
+            self._rows.remove(event.row)
+            event.row.remove()
+            if self._last_input is event.row.flag_input:
+                self._last_input = self._rows[-1].flag_input
 
     def save_flags(self) -> None:
-        flags = set()
-        for input_row in self.inputs_container.query(".input-row"):
-            input_widget = input_row.query_one(Input)
-            ignore_button = input_row.query_one(".ignore-button")
-            is_active = "ignore-active" in ignore_button.classes
-            if stripped_value := input_widget.value.strip():
-                flags.add((stripped_value, is_active))
-
-        self.app.pytest_cli_flags = list(flags)  # type: ignore
+        # a dict dedups like a set but keeps the flags in the order they were entered
+        flags: dict[tuple[str, bool], None] = {}
+        for input_row in self._rows:
+            if stripped_value := input_row.flag_input.value.strip():
+                flags[(stripped_value, input_row.is_active)] = None
+
+        self.app.set_pytest_cli_flags(list(flags))  # type: ignore
 
     def on_key(self, event) -> None:
         if event.key == "escape":
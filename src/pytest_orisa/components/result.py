@@ -17,6 +17,8 @@ from textual.widgets import (
     TabPane,
 )
 
+RUN_AT_FORMAT = "%m/%d/%Y, %I:%M:%S %p"
+
 
 class GoToTest(Message):
     """A message to navigate to a specific test"""
@@ -40,6 +42,17 @@ class PassedTestDataTable(DataTable):
         self.post_message(GoToTest(nodeid))
 
 
+class StatusBar(Grid):
+    DEFAULT_CSS = """
+        StatusBar {
+            height: 1;
+            background: $panel;
+            dock: bottom;
+            margin-top: 1;
+        }
+    """
+
+
 class TestOutputDisplay(Label):
     DEFAULT_CSS = """
         TestOutputDisplay {
@@ -48,12 +61,7 @@ class TestOutputDisplay(Label):
                 width: 100%
             }
 
-            & > Grid {
-                height: 1;
-                background: $panel;
-                dock: bottom;
-                margin-top: 1;
-
+            & > StatusBar {
                 & > #go-to-test {
                     dock: left;
                     background: darkgrey;
@@ -75,7 +83,7 @@ class TestOutputDisplay(Label):
 
     def compose(self) -> ComposeResult:
         yield Label(self.content)
-        yield Grid(
+        yield StatusBar(
             Button("✂ Copy output", id="copy-to-clipboard"),
             Button("↪  Go to test", id="go-to-test"),
         )
@@ -90,14 +98,28 @@ class TestOutputDisplay(Label):
         self.post_message(GoToTest(self.nodeid))
 
 
-class TestSessionStatusBar(Grid):
+class TestOutputCollapsible(Collapsible):
+    """A collapsible test output, built the first time it is expanded"""
+
+    def __init__(self, text: str, lexer: str, nodeid: str) -> None:
+        self.text: str = text
+        self.lexer: str = lexer
+        self.nodeid: str = nodeid
+        self.output_display: TestOutputDisplay | None = None
+        super().__init__(title=nodeid)
+
+    def on_collapsible_expanded(self, event: Collapsible.Expanded) -> None:
+        if event.collapsible is not self or self.output_display is not None:
+            return
+
+        content = Syntax(self.text, self.lexer, theme="ansi_dark")
+        self.output_display = TestOutputDisplay(content, nodeid=self.nodeid)
+        self.query_one(Collapsible.Contents).mount(self.output_display)
+
+
+class TestSessionStatusBar(StatusBar):
     DEFAULT_CSS = """
         TestSessionStatusBar {
-            height: 1;
-            background: $panel;
-            dock: bottom;
-            margin-top: 1;
-
             & > #run-at {
                 dock: left;
                 color: $text-muted;
@@ -120,7 +142,7 @@ class TestSessionStatusBar(Grid):
 
     def compose(self) -> ComposeResult:
         yield Label(
-            f" Test run at {datetime.now().strftime('%m/%d/%Y, %I:%M:%S %p')}",
+            f" Test run at {datetime.now():{RUN_AT_FORMAT}}",
             id="run-at",
         )
         yield Button("Cancel", id="action-button")
@@ -197,13 +219,14 @@ class RunResult(TabbedContent):
 
     async def on_mount(self) -> None:
         await self.add_pane(TabPane("running", self.run_log, id="summary"))
-        self.get_pane("summary").mount(TestSessionStatusBar(lines=self.run_log.lines))
+        self.status_bar = TestSessionStatusBar(lines=self.run_log.lines)
+        self.get_pane("summary").mount(self.status_bar)
         self.add_class("-running")
 
     async def watch_report(self, report: dict) -> None:
         self.remove_class("-running")
         self.update_summary_tab(report)
-        self.query_one(TestSessionStatusBar).test_session_finished()
+        self.status_bar.test_session_finished()
         await self.push_passed_tests(report)
         await self.push_failed_tests(report)
         await self.push_skipped_tests(report)
@@ -221,19 +244,20 @@ class RunResult(TabbedContent):
         if not failed_reports:
             return
 
-        entries: list[Collapsible] = []
-        for report in failed_reports:
-            content = Syntax(
-                report["longreprtext"] + report["capstderr"] + report["caplog"],
+        entries: list[Collapsible] = [
+            TestOutputCollapsible(
+                "".join(
+                    (
+                        report.get("longreprtext", ""),
+                        report.get("capstderr", ""),
+                        report.get("caplog", ""),
+                    )
+                ),
                 "python",
-                theme="ansi_dark",
-            )
-            entries.append(
-                Collapsible(
-                    TestOutputDisplay(content, nodeid=report["nodeid"]),
-                    title=report["nodeid"],
-                )
+                nodeid=report["nodeid"],
             )
+            for report in failed_reports
+        ]
 
         await self.add_pane(
             TabPane(
@@ -260,22 +284,29 @@ class RunResult(TabbedContent):
             )
         )
 
+        setup_durations: dict[str, float] = report["setup_durations"]
+        teardown_durations: dict[str, float] = report["teardown_durations"]
+
+        rows = []
         for passed in passed_reports:
             nodeid = passed["nodeid"]
-            setup_duration = report["setup_durations"][nodeid]
+            setup_duration = setup_durations[nodeid]
             call_duration = passed["call_duration"]
-            teardown_duration = report["teardown_durations"][nodeid]
+            teardown_duration = teardown_durations[nodeid]
             total_duration = setup_duration + call_duration + teardown_duration
             fixtures_count = len(passed["fixtures"])
 
-            table.add_row(
-                nodeid,
-                f"{setup_duration:.1f}s",
-                f"{call_duration:.1f}s",
-                f"{teardown_duration:.1f}s",
-                f"{total_duration:.1f}s",
-                f"{fixtures_count:,d}",
+            rows.append(
+                (
+                    nodeid,
+                    f"{setup_duration:.1f}s",
+                    f"{call_duration:.1f}s",
+                    f"{teardown_duration:.1f}s",
+                    f"{total_duration:.1f}s",
+                    f"{fixtures_count:,d}",
+                )
             )
+        table.add_rows(rows)
 
         await self.add_pane(
             TabPane(
@@ -293,8 +324,9 @@ class RunResult(TabbedContent):
         table = PassedTestDataTable(cursor_type="row")
         table.add_columns("Test", "Skip reason")
 
-        for skipped in skipped_reports:
-            table.add_row(skipped["nodeid"], skipped["skip_reason"])
+        table.add_rows(
+            (skipped["nodeid"], skipped["skip_reason"]) for skipped in skipped_reports
+        )
 
         await self.add_pane(
             TabPane(
@@ -309,15 +341,16 @@ class RunResult(TabbedContent):
         logs_entries: list[Collapsible] = []
         for test_report in passed_reports:
             if test_report.get("longreprtext") or test_report.get("caplog"):
-                content = Syntax(
-                    test_report.get("longreprtext", "") + test_report.get("caplog", ""),
-                    "KernelLogLexer",
-                    theme="ansi_dark",
-                )
                 logs_entries.append(
-                    Collapsible(
-                        TestOutputDisplay(content, nodeid=test_report["nodeid"]),
-                        title=test_report["nodeid"],
+                    TestOutputCollapsible(
+                        "".join(
+                            (
+                                test_report.get("longreprtext", ""),
+                                test_report.get("caplog", ""),
+                            )
+                        ),
+                        "KernelLogLexer",
+                        nodeid=test_report["nodeid"],
                     )
                 )
 
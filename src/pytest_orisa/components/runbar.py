@@ -50,20 +50,20 @@ class NodePreview(Container):
 
     def compose(self) -> ComposeResult:
         self.can_focus = False
-        yield Static("", id="preview")
-        yield Button("</> Show code", id="show-code")
+        self.preview = Static("", id="preview")
+        self.show_code = Button("</> Show code", id="show-code")
+        yield self.preview
+        yield self.show_code
         self.display = False
 
     def watch_node_data(self, node_data: dict) -> None:
         if node_data:
-            preview: Static = self.query_one("#preview", Static)
-            show_code: Button = self.query_one("#show-code", Button)
             node_type = node_data["type"]
 
             self.display = True
             path = self.app.build_breadcrumb_from_path()  # type: ignore
-            preview.update(f" [cyan]{node_type.upper()[0]}[/] | {path} ")
-            show_code.display = node_type != "DIR"
+            self.preview.update(f" [cyan]{node_type.upper()[0]}[/] | {path} ")
+            self.show_code.display = node_type != "DIR"
 
 
 class RunBar(Horizontal):
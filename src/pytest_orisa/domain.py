@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import json
+import math
+import struct
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional, installed with the "fast" extra
+    orjson = None
+
 
 class NodeType(str, Enum):
     DIR = "DIR"
@@ -20,26 +27,90 @@ class EventType(str, Enum):
     REPORT = "REPORT"
 
 
-@dataclass(frozen=True)
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        # serializes the report dataclasses natively, skipping underscored fields
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=to_json_compatible).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def to_json_compatible(value: Any) -> dict[str, Any]:
+    if isinstance(value, (Report, TestItem)):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+EVENT_TYPES: dict[str, EventType] = {
+    event_type.value: event_type for event_type in EventType
+}
+
+
+# TEST_OUTCOME is sent once per test with a fixed shape, so it skips JSON: the
+# opcode, the status index and the duration (NaN for none), then the nodeid
+TEST_OUTCOME_OPCODE = b"\x01"
+TEST_OUTCOME_RECORD = struct.Struct(">cBd")
+TEST_OUTCOME_STATUSES = ("running", "passed", "failed", "skipped")
+TEST_OUTCOME_STATUS_CODES = {
+    status: code for code, status in enumerate(TEST_OUTCOME_STATUSES)
+}
+
+
+@dataclass(eq=False)
 class Event:
     type: EventType
-    data: dict | list
+    data: dict | list | Report
 
-    def serialize(self) -> str:
-        return json.dumps(
+    def to_json(self) -> bytes:
+        return dumps(
             {
                 "type": self.type,
                 "data": self.data,
             }
         )
 
+    def encode(self) -> bytes:
+        if self.type is not EventType.TEST_OUTCOME:
+            return self.to_json()
+
+        data: dict = self.data  # type: ignore
+        duration = data["duration"]
+        return (
+            TEST_OUTCOME_RECORD.pack(
+                TEST_OUTCOME_OPCODE,
+                TEST_OUTCOME_STATUS_CODES[data["status"]],
+                math.nan if duration is None else duration,
+            )
+            + data["nodeid"].encode("utf-8")
+        )
+
+    @classmethod
+    def decode(cls, payload: bytes) -> Event:
+        if payload[:1] != TEST_OUTCOME_OPCODE:
+            return cls.deserialize(payload)
+
+        _, status, duration = TEST_OUTCOME_RECORD.unpack_from(payload)
+        return cls(
+            type=EventType.TEST_OUTCOME,
+            data={
+                "nodeid": payload[TEST_OUTCOME_RECORD.size :].decode("utf-8"),
+                "status": TEST_OUTCOME_STATUSES[status],
+                "duration": None if math.isnan(duration) else duration,
+            },
+        )
+
     @classmethod
-    def deserialize(cls, json_str: str) -> Event:
-        parsed = json.loads(json_str)
-        return cls(type=EventType(parsed["type"]), data=parsed["data"])
+    def deserialize(cls, json_str: bytes | str) -> Event:
+        parsed = loads(json_str)
+        return cls(type=EVENT_TYPES[parsed["type"]], data=parsed["data"])
 
 
-@dataclass
+@dataclass(slots=True)
 class TestItem:
     nodeid: str
     call_duration: float = 0.0
@@ -50,8 +121,11 @@ class TestItem:
     longreprtext: str = ""
     capstderr: str = ""
 
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
-@dataclass
+@dataclass(slots=True)
 class Report:
     passed: list[TestItem] = field(default_factory=list)
     failed: list[TestItem] = field(default_factory=list)
@@ -61,10 +135,27 @@ class Report:
     teardown_durations: dict[str, float] = field(default_factory=dict)
     total_duration: float = 0.0
     exit_status: int = 0
+    # lookup of the items above, not part of the payload
+    _by_nodeid: dict[str, TestItem] = field(default_factory=dict, repr=False)
+
+    def add_test_item(self, test_item: TestItem) -> None:
+        # statuses double as the names of the lists the items are kept in
+        getattr(self, test_item.status).append(test_item)
+        self._by_nodeid[test_item.nodeid] = test_item
 
     def get_test_item_by_nodeid(self, nodeid: str) -> TestItem | None:
-        for test_list in [self.passed, self.failed, self.skipped, self.xfailed]:
-            for test_item in test_list:
-                if test_item.nodeid == nodeid:
-                    return test_item
-        return None
+        return self._by_nodeid.get(nodeid)
+
+    def to_dict(self) -> dict[str, Any]:
+        # unlike dataclasses.asdict this shares the live values instead of deep
+        # copying every item, it is only read to serialize the REPORT event
+        return {
+            "passed": [test_item.to_dict() for test_item in self.passed],
+            "failed": [test_item.to_dict() for test_item in self.failed],
+            "skipped": [test_item.to_dict() for test_item in self.skipped],
+            "xfailed": [test_item.to_dict() for test_item in self.xfailed],
+            "setup_durations": self.setup_durations,
+            "teardown_durations": self.teardown_durations,
+            "total_duration": self.total_duration,
+            "exit_status": self.exit_status,
+        }
@@ -1,94 +1,178 @@
 import asyncio
-import json
+import atexit
+import logging
+import os
 import socket
+import struct
 import threading
 from typing import Callable
 
 from pytest_orisa.domain import Event
 
+logger: logging.Logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct(">I")
+HEADER_SIZE = HEADER.size
+# small frames are joined into one write, bigger payloads (the final report) are
+# written as they are instead of being copied into the joined buffer
+COALESCE_LIMIT = 1 << 16
+LISTEN_BACKLOG = 128
+
 
 class EventDispatcher:
     def __init__(self, host="localhost", port=1337) -> None:
         self.host = host
         self.port = port
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if os.name != "nt":
+            # rebind right away after a restart, while the previous session's
+            # connections sit in TIME_WAIT (on Windows it would allow port theft)
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(5)
+        self.server_socket.listen(LISTEN_BACKLOG)
         self.shutdown_flag = threading.Event()
-        self.client_threads = []
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.stopped: asyncio.Event | None = None
+        self.clients: dict[asyncio.StreamWriter, asyncio.Task] = {}
         self.event_handlers = {}
         self.event_data = {}
-        self.lock = threading.Lock()
 
     def register_handler(self, event_type: str, handler: Callable) -> None:
-        with self.lock:
-            self.event_handlers[event_type] = handler
+        self.event_handlers[event_type] = handler
 
-    def handle_client(self, client_socket):
-        buffer = ""
-        while not self.shutdown_flag.is_set():
-            try:
-                data = client_socket.recv(1024)
-                if not data:
-                    break
-                buffer += data.decode("utf-8")
-
-                while True:
-                    try:
-                        # Try to decode the buffer as JSON
-                        event = json.loads(buffer)
-                        event_type: str = event.get("type")
-                        data = event.get("data")
-
-                        with self.lock:
-                            handler = self.event_handlers.get(event_type)
-
-                        if handler:
-                            handler(data)
-
-                        # Store the data if no handler is specified
-                        if event_type not in self.event_handlers:
-                            self.event_data[event_type] = data
-
-                        # Clear the buffer after processing
-                        buffer = ""
-                        break
-                    except json.JSONDecodeError:
-                        # If JSON is incomplete, break and wait for more data
-                        break
-            except ConnectionResetError:
-                break
-
-        client_socket.close()
+    def register_handlers(self, handlers: dict[str, Callable]) -> None:
+        self.event_handlers.update(handlers)
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # every event is framed as a 4-byte big-endian length followed by the
+        # encoded event, so each one is parsed exactly once
+        self.clients[writer] = asyncio.current_task()  # type: ignore
+        try:
+            while True:
+                header = await reader.readexactly(HEADER_SIZE)
+                (size,) = HEADER.unpack(header)
+                payload = await reader.readexactly(size)
+                try:
+                    self.dispatch(Event.decode(payload))
+                except Exception:
+                    # the frame was read in full, so the stream is still in sync
+                    # and only this event is lost, not the rest of the run
+                    logger.exception("Failed to dispatch event")
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            # the client went away, possibly in the middle of a frame
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    def dispatch(self, event: Event) -> None:
+        handler = self.event_handlers.get(event.type)
+        if handler:
+            handler(event.data)
+        else:
+            # Store the data if no handler is specified
+            self.event_data[event.type] = event.data
+
+    async def serve(self) -> None:
+        self.stopped = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        if self.shutdown_flag.is_set():
+            # stopped before serving, nothing else will close the socket
+            self.server_socket.close()
+            return
+
+        server = await asyncio.start_server(self.handle_client, sock=self.server_socket)
+        await self.stopped.wait()
+        server.close()
+        # closing the transports ends the pending reads, let the handlers finish
+        clients = list(self.clients.items())
+        for writer, _ in clients:
+            writer.close()
+        await asyncio.gather(*(task for _, task in clients), return_exceptions=True)
 
     def start(self) -> None:
-        while not self.shutdown_flag.is_set():
-            try:
-                client_socket, addr = self.server_socket.accept()
-                client_thread = threading.Thread(
-                    target=self.handle_client, args=(client_socket,)
-                )
-                self.client_threads.append(client_thread)
-                client_thread.start()
-            except socket.timeout:
-                continue
+        # blocks, all clients are served by one event loop on the calling thread
+        asyncio.run(self.serve())
 
     def stop(self) -> None:
+        # quitting can be requested more than once, only the first call acts
+        if self.shutdown_flag.is_set():
+            return
+
         self.shutdown_flag.set()
-        self.server_socket.close()
-        for thread in self.client_threads:
-            thread.join()
+        if self.loop is not None and self.stopped is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.stopped.set)
+            except RuntimeError:
+                # serve() has already returned and asyncio.run closed the loop
+                pass
+        else:
+            self.server_socket.close()
 
     def get_event_data(self, event_type: str):
+        return self.event_data.get(event_type, None)
+
+
+class EventClient:
+    """One connection to the dispatcher, reused for every event a process sends."""
+
+    def __init__(self, host="localhost", port=1337) -> None:
+        self.host = host
+        self.port = port
+        self.client_socket: socket.socket | None = None
+        self.lock = threading.Lock()
+
+    def send(self, parts: list[bytes]) -> None:
         with self.lock:
-            return self.event_data.get(event_type, None)
+            if self.client_socket is None:
+                self.client_socket = socket.create_connection((self.host, self.port))
+                # events are small and latency matters more than packet count
+                self.client_socket.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+                )
+
+            try:
+                self._send_parts(self.client_socket, parts)
+            except OSError:
+                # a broken connection is not reused, the next send reconnects
+                self.client_socket.close()
+                self.client_socket = None
+                raise
+
+    @staticmethod
+    def _send_parts(client_socket: socket.socket, parts: list[bytes]) -> None:
+        pending: list[bytes] = []
+        for part in parts:
+            if len(part) <= COALESCE_LIMIT:
+                pending.append(part)
+                continue
+            if pending:
+                client_socket.sendall(b"".join(pending))
+                pending.clear()
+            client_socket.sendall(part)
+        if pending:
+            client_socket.sendall(b"".join(pending))
+
+    def close(self) -> None:
+        with self.lock:
+            if self.client_socket is not None:
+                self.client_socket.close()
+                self.client_socket = None
+
+
+CLIENT = EventClient()
+atexit.register(CLIENT.close)
+
+
+def frame_event(event: Event) -> tuple[bytes, bytes]:
+    payload = event.encode()
+    return HEADER.pack(len(payload)), payload
 
 
-def send_event(event: Event) -> None:
-    client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    client_socket.connect(("localhost", 1337))
-    client_socket.sendall(event.serialize().encode("utf-8"))
-    client_socket.close()
+def send_events(events: list[Event]) -> None:
+    CLIENT.send([part for event in events for part in frame_event(event)])
 
 
 async def wait_for_server(host, port, max_retries=5, retry_delay=0.1) -> None:
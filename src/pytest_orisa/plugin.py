@@ -1,8 +1,9 @@
 import logging
 import os
+import queue
 import subprocess
+import threading
 import time
-from dataclasses import asdict
 from typing import Any, Generator
 
 import pytest
@@ -21,7 +22,7 @@ from pytest import (
 )
 
 from pytest_orisa.domain import Event, EventType, NodeType, Report, TestItem
-from pytest_orisa.event_dispatcher import send_event
+from pytest_orisa.event_dispatcher import send_events
 
 logging.basicConfig(level=logging.ERROR)
 logger: logging.Logger = logging.getLogger(__name__)
@@ -29,31 +30,66 @@ logger: logging.Logger = logging.getLogger(__name__)
 
 REPORT = Report()
 
+# resolved once in pytest_configure, the per-test hooks check it for every test;
+# kept on the config so a nested session (pytester, pytest.main) can't reset it
+ORISA_ENABLED = pytest.StashKey[bool]()
+SESSION_START = pytest.StashKey[int]()
+
+# events are handed to a background thread that sends whatever has piled up in
+# one write, so the test loop never waits on the socket; None stops it
+EVENT_QUEUE: queue.SimpleQueue[Event | None] = queue.SimpleQueue()
+
+
+def flush_events() -> None:
+    # once sending fails (the TUI went away) the rest is dropped, but the queue
+    # is still drained up to the sentinel so pytest_unconfigure can join
+    send_failed = False
+    while True:
+        events = [EVENT_QUEUE.get()]
+        while not EVENT_QUEUE.empty():
+            events.append(EVENT_QUEUE.get_nowait())
+
+        stopped = None in events
+        if stopped:
+            events = events[: events.index(None)]
+        if events and not send_failed:
+            try:
+                send_events(events)  # type: ignore
+            except OSError:
+                send_failed = True
+                logger.exception("Failed to send events to orisa, dropping the rest")
+        if stopped:
+            return
+
+
+# started in pytest_configure, so every configure in a process gets its own thread
+EVENT_SENDER = pytest.StashKey[threading.Thread]()
+
+
+def queue_event(event: Event) -> None:
+    EVENT_QUEUE.put(event)
+
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(
     item: Item, call: CallInfo[None]
 ) -> Generator[None, Any, None]:
-    if item.config.getoption("--enable-orisa"):
+    if item.config.stash[ORISA_ENABLED]:
         outcome = yield
         report: TestReport = outcome.get_result()
-        nodeid = report.nodeid
+        if not report.skipped and report.when != "call":
+            # nothing is recorded for passing/failing setup and teardown phases
+            return
 
-        test_item = next(
-            (
-                t
-                for t in REPORT.passed + REPORT.failed + REPORT.skipped + REPORT.xfailed
-                if t.nodeid == nodeid
-            ),
-            None,
-        )
+        nodeid = report.nodeid
+        test_item = REPORT.get_test_item_by_nodeid(nodeid)
         if test_item is None:
             test_item = TestItem(nodeid=nodeid)
 
         if report.skipped:
             test_item.status = "skipped"
             test_item.skip_reason = str(report.longrepr[2]) if report.longrepr else ""  # type: ignore
-            REPORT.skipped.append(test_item)
+            REPORT.add_test_item(test_item)
 
         elif report.when == "call":
             test_item.call_duration = report.duration
@@ -63,19 +99,21 @@ def pytest_runtest_makereport(
                 test_item.fixtures = [
                     {
                         "argname": argname,
-                        "scope": fixture[0].scope,
+                        "scope": fixturedefs[0].scope,
                     }
-                    for argname, fixture in item._fixtureinfo.name2fixturedefs.items()
+                    for argname, fixturedefs in (
+                        item._fixtureinfo.name2fixturedefs.items()
+                    )
                 ]
                 test_item.caplog = report.caplog
-                REPORT.passed.append(test_item)
+                REPORT.add_test_item(test_item)
 
             elif report.failed:
                 test_item.status = "failed"
                 test_item.longreprtext = report.longreprtext
                 test_item.capstderr = report.capstderr
                 test_item.caplog = report.caplog
-                REPORT.failed.append(test_item)
+                REPORT.add_test_item(test_item)
 
     else:
         yield
@@ -85,7 +123,7 @@ def pytest_runtest_makereport(
 def pytest_runtest_logfinish(nodeid: str, location: tuple) -> None:
     test_item: TestItem | None = REPORT.get_test_item_by_nodeid(nodeid)
     if test_item is not None:
-        send_event(
+        queue_event(
             Event(
                 type=EventType.TEST_OUTCOME,
                 data={
@@ -105,105 +143,100 @@ def pytest_runtest_logfinish(nodeid: str, location: tuple) -> None:
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_setup(item: Item) -> Generator:
-    if item.config.getoption("--enable-orisa"):
-        nodeid = item.nodeid
-        start_time = time.time()
+    if item.config.stash[ORISA_ENABLED]:
+        start = time.perf_counter_ns()
         yield
-        end_time = time.time()
-        REPORT.setup_durations[nodeid] = end_time - start_time
+        REPORT.setup_durations[item.nodeid] = (time.perf_counter_ns() - start) / 1e9
     else:
         yield
 
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_teardown(item: Item) -> Generator:
-    if item.config.getoption("--enable-orisa"):
-        nodeid = item.nodeid
-        start_time = time.time()
+    if item.config.stash[ORISA_ENABLED]:
+        start = time.perf_counter_ns()
         yield
-        end_time = time.time()
-        REPORT.teardown_durations[nodeid] = end_time - start_time
+        REPORT.teardown_durations[item.nodeid] = (
+            time.perf_counter_ns() - start
+        ) / 1e9
     else:
         yield
 
 
+def pytest_sessionstart(session: Session) -> None:
+    session.stash[SESSION_START] = time.perf_counter_ns()
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_sessionfinish(session: Session, exitstatus: ExitCode) -> None:
-    if session.config.getoption("--enable-orisa") and not session.config.getoption(
+    if session.config.stash[ORISA_ENABLED] and not session.config.getoption(
         "--collect-only"
     ):
         REPORT.total_duration = (
-            time.time()
-            - session.config.pluginmanager.get_plugin(
-                "terminalreporter"
-            )._sessionstarttime
-        )
+            time.perf_counter_ns() - session.stash[SESSION_START]
+        ) / 1e9
         REPORT.exit_status = exitstatus
-        send_event(
+        queue_event(
             Event(
                 type=EventType.REPORT,
-                data=asdict(REPORT),
+                data=REPORT,
             )
         )
 
 
 def build_pytest_tree(items: list[nodes.Item]) -> dict:
+    # a collection has few node classes but many nodes of each
+    node_types: dict[type, str] = {}
+
     def create_node_data(
         node: Node, parent_type: str | None = None, parent_name: str | None = None
     ) -> dict:
+        node_class = type(node)
+        node_type = node_types.get(node_class)
+        if node_type is None:
+            node_type = node_types[node_class] = node_class.__name__.upper()
+
+        if isinstance(node, Function):
+            lineno = node.location[1]
+        elif isinstance(node, Class):
+            lineno = node.reportinfo()[1]
+        else:
+            lineno = 0
+
         return {
             "name": node.name,
             "path": str(node.path),
-            "type": type(node).__name__.upper(),
+            "type": node_type,
             "parent_type": parent_type,
             "parent_name": parent_name,
-            "lineno": node.reportinfo()[1]
-            if isinstance(node, Class)
-            else (node.location[1] if isinstance(node, Function) else 0),
+            "lineno": lineno,
             "nodeid": node.nodeid,
             "children": [],
         }
 
-    def add_to_tree(
-        nodes: list[Node],
-        tree: dict,
-        parent_type: str | None = None,
-        parent_name: str | None = None,
-    ) -> None:
-        if not nodes:
-            return
-
-        node: Node = nodes.pop(0)
-        node_data: dict = create_node_data(node, parent_type, parent_name)
-
-        if "children" not in tree:
-            tree["children"] = []
-
-        existing_node = next(
-            (child for child in tree["children"] if child["name"] == node_data["name"]),
-            None,
-        )
-        if existing_node is None:
-            tree["children"].append(node_data)
-            existing_node = node_data
-
-        add_to_tree(nodes, existing_node, type(node).__name__.upper(), node.name)
-
     tree: dict = {"data": {}, "meta": {"total": len(items)}}
+    # children of every node dict by name, kept beside the tree (keyed on the
+    # dict's id) so that no scratch keys end up in the payload
+    children_by_name: dict[int, dict[str, dict]] = {}
 
     for item in items:
         needed_collectors: list[Node] = item.listchain()[1:]  # strip root node
-        if needed_collectors:
-            root_node = needed_collectors[0]
-            root_name = root_node.name
-            if root_name not in tree["data"]:
-                tree["data"][root_name] = create_node_data(root_node)
-            add_to_tree(
-                needed_collectors[1:],
-                tree["data"][root_name],
-                type(root_node).__name__.upper(),
-                root_name,
-            )
+        if not needed_collectors:
+            continue
+
+        root_node = needed_collectors[0]
+        parent: dict | None = tree["data"].get(root_node.name)
+        if parent is None:
+            parent = tree["data"][root_node.name] = create_node_data(root_node)
+
+        for node in needed_collectors[1:]:
+            siblings = children_by_name.setdefault(id(parent), {})
+            node_data = siblings.get(node.name)
+            if node_data is None:
+                node_data = create_node_data(node, parent["type"], parent["name"])
+                parent["children"].append(node_data)
+                siblings[node.name] = node_data
+            parent = node_data
 
     return tree
 
@@ -219,6 +252,14 @@ def pytest_addoption(parser):
 
 @pytest.hookimpl(trylast=True)
 def pytest_configure(config: Config) -> None:
+    config.stash[ORISA_ENABLED] = config.getoption("--enable-orisa")
+    if config.stash[ORISA_ENABLED]:
+        event_sender = threading.Thread(
+            target=flush_events, name="orisa-events", daemon=True
+        )
+        event_sender.start()
+        config.stash[EVENT_SENDER] = event_sender
+
     run_log_width = os.getenv("ORISA_RUN_LOG_WIDTH")
     if run_log_width is not None:
         run_log_width = int(run_log_width)
@@ -230,9 +271,9 @@ def pytest_configure(config: Config) -> None:
 def pytest_collection_modifyitems(
     session: Session, config: Config, items: list[nodes.Item]
 ) -> None:
-    if config.getoption("--enable-orisa"):
+    if config.stash[ORISA_ENABLED]:
         if config.getoption("--collect-only"):
-            send_event(
+            queue_event(
                 Event(
                     type=EventType.TESTS_COLLECTED,
                     data=build_pytest_tree(items),
@@ -241,10 +282,10 @@ def pytest_collection_modifyitems(
 
 
 def pytest_collection_finish(session: Session) -> None:
-    if session.config.getoption("--enable-orisa") and not session.config.getoption(
+    if session.config.stash[ORISA_ENABLED] and not session.config.getoption(
         "--collect-only"
     ):
-        send_event(
+        queue_event(
             Event(
                 type=EventType.TESTS_SCHEDULED,
                 data=[item.nodeid for item in session.items],
@@ -252,6 +293,15 @@ def pytest_collection_finish(session: Session) -> None:
         )
 
 
+def pytest_unconfigure(config: Config) -> None:
+    event_sender = config.stash.get(EVENT_SENDER, None)
+    if event_sender is not None:
+        del config.stash[EVENT_SENDER]
+        # make sure every queued event, the final report included, went out
+        EVENT_QUEUE.put(None)
+        event_sender.join()
+
+
 def collect_tests() -> None:
     try:
         subprocess.run(
@@ -268,23 +318,24 @@ def collect_tests() -> None:
 
 def run_node(
     node: dict | None, pytest_cli_flags: list[tuple[str, bool]]
-) -> subprocess.Popen[str]:
+) -> subprocess.Popen[bytes]:
     if node is not None:
         if node["type"] == NodeType.FUNCTION and node["parent_type"] == NodeType.CLASS:
             path = f"{node['path']}::{node['parent_name']}::{node['name']}"
-        elif node["type"] in [NodeType.CLASS, NodeType.FUNCTION]:
+        elif node["type"] in (NodeType.CLASS, NodeType.FUNCTION):
             path = f"{node['path']}::{node['name']}"
         else:
             path = node["path"]
 
-        args: list[str] = [path, "--enable-orisa"]
-        for flag, is_active in pytest_cli_flags:
-            if is_active:
-                args.append(flag)
+        args: list[str] = [
+            path,
+            "--enable-orisa",
+            *(flag for flag, is_active in pytest_cli_flags if is_active),
+        ]
 
     return subprocess.Popen(
         ["pytest", *args],
-        text=True,
+        bufsize=0,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
     )